@@ -19,7 +19,7 @@ class SigningKey:
 
 
 def verify_ota(ota: Path, public_key_avb: Path | None, cert_ota: Path | None):
-    logger.info(f'Verifying OTA: {ota}')
+    logger.info('Verifying OTA: %s', ota)
 
     cmd = [
         'avbroot', 'ota', 'verify',
@@ -38,7 +38,7 @@ def verify_ota(ota: Path, public_key_avb: Path | None, cert_ota: Path | None):
 
 
 def unpack_ota(ota: Path, output_dir: Path, partitions: Iterable[str]):
-    logger.info(f'Unpacking OTA: {ota}')
+    logger.info('Unpacking OTA: %s', ota)
 
     cmd = [
         'avbroot', 'ota', 'extract',
@@ -63,7 +63,7 @@ def patch_ota(
     extra_args: Sequence[str],
 ):
     image_names = ', '.join(sorted(replace.keys())) if replace else '(none)'
-    logger.info(f'Patching OTA with replaced images: {image_names}: {output_ota}')
+    logger.info('Patching OTA with replaced images: %s: %s', image_names, output_ota)
 
     cmd = [
         'avbroot', 'ota', 'patch',
@@ -98,7 +98,7 @@ def patch_ota(
 
 
 def unpack_avb(image: Path, output_dir: Path):
-    logger.info(f'Unpacking AVB image: {image}')
+    logger.info('Unpacking AVB image: %s', image)
 
     subprocess.check_call([
         'avbroot', 'avb', 'unpack',
@@ -113,7 +113,7 @@ def pack_avb(
     key: SigningKey,
     recompute_size: bool,
 ):
-    logger.info(f'Packing AVB image: {image}')
+    logger.info('Packing AVB image: %s', image)
 
     cmd = [
         'avbroot', 'avb', 'pack',
@@ -136,7 +136,7 @@ def pack_avb(
 
 
 def unpack_boot(image: Path, output_dir: Path):
-    logger.info(f'Unpacking boot image: {image}')
+    logger.info('Unpacking boot image: %s', image)
 
     subprocess.check_call([
         'avbroot', 'boot', 'unpack',
@@ -146,7 +146,7 @@ def unpack_boot(image: Path, output_dir: Path):
 
 
 def pack_boot(image: Path, input_dir: Path):
-    logger.info(f'Packing boot image: {image}')
+    logger.info('Packing boot image: %s', image)
 
     subprocess.check_call([
         'avbroot', 'boot', 'pack',
@@ -156,7 +156,7 @@ def pack_boot(image: Path, input_dir: Path):
 
 
 def unpack_cpio(archive: Path, output_dir: Path):
-    logger.info(f'Unpacking CPIO archive: {archive}')
+    logger.info('Unpacking CPIO archive: %s', archive)
 
     subprocess.check_call([
         'avbroot', 'cpio', 'unpack',
@@ -166,7 +166,7 @@ def unpack_cpio(archive: Path, output_dir: Path):
 
 
 def pack_cpio(archive: Path, input_dir: Path):
-    logger.info(f'Packing CPIO archive: {archive}')
+    logger.info('Packing CPIO archive: %s', archive)
 
     subprocess.check_call([
         'avbroot', 'cpio', 'pack',
@@ -176,7 +176,7 @@ def pack_cpio(archive: Path, input_dir: Path):
 
 
 def unpack_fs(image: Path, output_dir: Path):
-    logger.info(f'Unpacking filesystem: {image}')
+    logger.info('Unpacking filesystem: %s', image)
 
     subprocess.check_call([
         'afsr', 'unpack',
@@ -185,7 +185,7 @@ def unpack_fs(image: Path, output_dir: Path):
 
 
 def pack_fs(image: Path, input_dir: Path):
-    logger.info(f'Packing filesystem: {image}')
+    logger.info('Packing filesystem: %s', image)
 
     subprocess.check_call([
         'afsr', 'pack',
@@ -194,7 +194,7 @@ def pack_fs(image: Path, input_dir: Path):
 
 
 def generate_csig(ota: Path, key_ota: SigningKey, cert_ota: Path):
-    logger.info(f'Generating Custota csig: {ota}.csig')
+    logger.info('Generating Custota csig: %s.csig', ota)
 
     cmd = [
         'custota-tool', 'gen-csig',
@@ -214,7 +214,7 @@ def generate_csig(ota: Path, key_ota: SigningKey, cert_ota: Path):
 
 
 def generate_update_info(update_info: Path, location: str):
-    logger.info(f'Generating Custota update info: {update_info}')
+    logger.info('Generating Custota update info: %s', update_info)
 
     subprocess.check_call([
         'custota-tool', 'gen-update-info',
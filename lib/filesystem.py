@@ -177,7 +177,7 @@ class ExtFs:
         if not parent_entry:
             raise FileNotFoundError(parent)
 
-        logger.info(f'Adding {file_type} filesystem entry: {path}')
+        logger.info('Adding %s filesystem entry: %s', file_type, path)
 
         path_str = str(path)
         label = next(c[1] for c in self.contexts if c[0].fullmatch(path_str))
@@ -10,6 +10,9 @@ import uuid
 
 _IS_LINUX = sys.platform == 'linux' or sys.platform == 'android'
 
+# The host architecture cannot change while we're running.
+_HOST_MACHINE = platform.machine()
+
 StrPath = str | os.PathLike[str]
 
 
@@ -75,21 +78,28 @@ def linux_run(
 
 def linux_arch() -> str:
     if _IS_LINUX:
-        return platform.machine()
+        return _HOST_MACHINE
     else:
         result = _adb_run(['uname', '-m'], check=True, capture_output=True)
         return result.stdout.decode('UTF-8').strip()
 
 
+_ANDROID_ABIS = {
+    'x86_64': 'x86_64',
+    'i386': 'x86',
+    'i486': 'x86',
+    'i586': 'x86',
+    'i686': 'x86',
+    'aarch64': 'arm64-v8a',
+}
+
+
 def linux_android_abi() -> str:
     arch = linux_arch()
 
-    if arch == 'x86_64':
-        return arch
-    elif arch == 'i386' or arch == 'i486' or arch == 'i586' or arch == 'i686':
-        return 'x86'
-    elif arch == 'aarch64':
-        return 'arm64-v8a'
+    abi = _ANDROID_ABIS.get(arch)
+    if abi is not None:
+        return abi
     elif arch.startswith('armv7'):
         return 'armeabi-v7a'
     else:
@@ -3,13 +3,17 @@
 
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 import dataclasses
+import functools
 import logging
+import os
 from pathlib import Path, PurePosixPath
-import shutil
+import struct
 import subprocess
 import tempfile
-from typing import Callable
+import threading
+from typing import IO, Callable
 import zipfile
 
 from lib.filesystem import CpioFs, ExtFs
@@ -25,23 +29,157 @@ SSH_PUBLIC_KEY_CHENXIAOLONG = \
     'ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIDOe6/tBnO7xZhAWXRj3ApUYgn+XZ0wnQiXM8B7tPgv4'
 
 
+# The allowed-signers file is identical for every zip signed by the same
+# key, so write it once per public key and reuse it across verifications.
+# Prefer tmpfs so the file never touches disk.
+_TRUSTED_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+_trusted_files: dict[str, IO[bytes]] = {}
+
+
+@functools.lru_cache
+def _trusted_signers_contents(public_key: str) -> bytes:
+    return b'trusted ' + public_key.encode('UTF-8')
+
+
+def _trusted_signers_file(public_key: str) -> str:
+    f_trusted = _trusted_files.get(public_key)
+
+    if f_trusted is None:
+        f_trusted = tempfile.NamedTemporaryFile(dir=_TRUSTED_DIR)
+        f_trusted.write(_trusted_signers_contents(public_key))
+        f_trusted.flush()
+
+        # Keeping the handle open keeps the file alive for the rest of the
+        # process and still cleans it up on exit.
+        _trusted_files[public_key] = f_trusted
+
+    return f_trusted.name
+
+
 def verify_ssh_sig(zip: Path, sig: Path, public_key: str):
-    logger.info(f'Verifying SSH signature: {zip}')
+    logger.info('Verifying SSH signature: %s', zip)
+
+    trusted_file = _trusted_signers_file(public_key)
+
+    # ssh-keygen only accepts the signed data on stdin. Hand it the zip
+    # as a raw descriptor so the child reads the file directly; the
+    # data never passes through this process.
+    fd = os.open(zip, os.O_RDONLY)
+    try:
+        subprocess.check_call([
+            'ssh-keygen',
+            '-Y', 'verify',
+            '-f', trusted_file,
+            '-I', 'trusted',
+            '-n', 'file',
+            '-s', sig,
+        ], stdin=fd)
+    finally:
+        os.close(fd)
+
+
+def _extract_stored(
+    zip: zipfile.ZipFile,
+    zinfo: zipfile.ZipInfo,
+    f_out,
+) -> bool:
+    """
+    Copy an uncompressed zip entry to f_out kernel-side, without moving the
+    data through userspace.
+
+    Returns False if the fast path is unavailable (compressed or encrypted
+    entry, non-fd-backed file objects, or unsupported syscalls), in which
+    case the caller must fall back to the normal copy loop.
+    """
+    if zinfo.compress_type != zipfile.ZIP_STORED or zinfo.flag_bits & 0x1:
+        return False
+
+    fp = zip.fp
+    try:
+        src_fd = fp.fileno()
+        dst_fd = f_out.fileno()
+    except (AttributeError, OSError):
+        return False
+
+    # The data offset is only known after parsing the local file header,
+    # whose name/extra field sizes may differ from the central directory's.
+    # Concurrent ZipExtFile reads share fp and seek under the ZipFile's
+    # internal lock, so take the same lock while seeking ourselves.
+    with getattr(zip, '_lock', threading.Lock()):
+        fp.seek(zinfo.header_offset)
+        header = fp.read(zipfile.sizeFileHeader)
+    if len(header) != zipfile.sizeFileHeader \
+            or not header.startswith(zipfile.stringFileHeader):
+        return False
+
+    name_len, extra_len = struct.unpack('<2H', header[26:30])
+    offset = zinfo.header_offset + zipfile.sizeFileHeader + name_len + extra_len
+    remaining = zinfo.file_size
+
+    while remaining > 0:
+        try:
+            n = os.copy_file_range(src_fd, dst_fd, remaining, offset_src=offset)
+        except (AttributeError, OSError):
+            try:
+                n = os.sendfile(dst_fd, src_fd, offset, remaining)
+            except (AttributeError, OSError):
+                break
+
+        if n == 0:
+            break
+
+        offset += n
+        remaining -= n
+
+    if remaining > 0:
+        # Partial or failed copy. Reset the output for the fallback path.
+        os.ftruncate(dst_fd, 0)
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        return False
+
+    return True
+
+
+# Scratch buffers for zip -> ExtFs copies. 1 MiB keeps the syscall count
+# low without reallocating a buffer per extracted file. One buffer per
+# thread so parallel extraction doesn't stomp on concurrent copies.
+_copy_buffers_local = threading.local()
+
+
+def _copy_buffers() -> tuple[bytearray, memoryview]:
+    try:
+        return _copy_buffers_local.buf, _copy_buffers_local.mv
+    except AttributeError:
+        buf = bytearray(1 << 20)
+        mv = memoryview(buf)
+        _copy_buffers_local.buf = buf
+        _copy_buffers_local.mv = mv
+        return buf, mv
+
+
+def _copy_entry(zip: zipfile.ZipFile, zinfo: zipfile.ZipInfo, f_out):
+    if zinfo.file_size == 0:
+        return
+
+    # Stored entries can skip userspace entirely.
+    if _extract_stored(zip, zinfo, f_out):
+        return
+
+    buf, mv = _copy_buffers()
 
-    with tempfile.NamedTemporaryFile(delete_on_close=False) as f_trusted:
-        f_trusted.write(b'trusted ')
-        f_trusted.write(public_key.encode('UTF-8'))
-        f_trusted.close()
+    with zip.open(zinfo, 'r') as f_in:
+        while True:
+            n = f_in.readinto(buf)
+            if not n:
+                break
+            f_out.write(mv[:n])
 
-        with open(zip, 'rb') as f_zip:
-            subprocess.check_call([
-                'ssh-keygen',
-                '-Y', 'verify',
-                '-f', f_trusted.name,
-                '-I', 'trusted',
-                '-n', 'file',
-                '-s', sig,
-            ], stdin=f_zip)
+
+def _copy_entry_and_close(zip: zipfile.ZipFile, zinfo: zipfile.ZipInfo, f_out):
+    try:
+        _copy_entry(zip, zinfo, f_out)
+    finally:
+        f_out.close()
 
 
 def zip_extract(
@@ -53,11 +191,56 @@ def zip_extract(
     output: str | None = None,
 ):
     path = PurePosixPath(output or name)
+    zinfo = zip.getinfo(name)
 
     fs.mkdir(path.parent, mode=parent_mode, parents=True, exist_ok=True)
     with fs.open(path, 'wb', mode=mode) as f_out:
-        with zip.open(name, 'r') as f_in:
-            shutil.copyfileobj(f_in, f_out)
+        _copy_entry(zip, zinfo, f_out)
+
+
+def zip_extract_all(
+    zip: zipfile.ZipFile,
+    entries: Iterable[str | tuple[str, str | None, int]],
+    fs: ExtFs,
+    parent_mode: int = 0o755,
+):
+    """
+    Extract multiple zip entries into fs, running the data copies in a
+    thread pool.
+
+    Each entry is either a name or a (name, output, mode) tuple with the
+    same meaning as the zip_extract() arguments. ExtFs metadata updates
+    are not thread-safe, so directories and output files are created on
+    the calling thread and only the byte copies are parallelized.
+    """
+    normalized = [
+        e if isinstance(e, tuple) else (e, None, 0o644)
+        for e in entries
+    ]
+
+    if len(normalized) <= 1:
+        for name, output, mode in normalized:
+            zip_extract(
+                zip, name, fs, mode=mode, parent_mode=parent_mode,
+                output=output,
+            )
+        return
+
+    with ThreadPoolExecutor() as executor:
+        pending = []
+
+        for name, output, mode in normalized:
+            path = PurePosixPath(output or name)
+            zinfo = zip.getinfo(name)
+
+            fs.mkdir(path.parent, mode=parent_mode, parents=True, exist_ok=True)
+            f_out = fs.open(path, 'wb', mode=mode)
+
+            pending.append(
+                executor.submit(_copy_entry_and_close, zip, zinfo, f_out))
+
+        for future in pending:
+            future.result()
 
 
 def append_seapp_contexts(
@@ -78,44 +261,66 @@ def append_seapp_contexts(
         ext_fs: Dictionary of filesystem objects by partition name
         compatible_sepolicy: If True, also append to vendor/odm seapp_contexts
     """
-    # Always append to plat_seapp_contexts
-    system_fs = ext_fs['system']
-    plat_seapp = 'system/etc/selinux/plat_seapp_contexts'
-    logger.info(f'Adding seapp contexts to: {plat_seapp}')
-
-    with (
-        zip.open(seapp_contexts_name, 'r') as f_in,
-        system_fs.open(plat_seapp, 'ab') as f_out,
-    ):
-        shutil.copyfileobj(f_in, f_out)
-        f_out.write(b'\n')
-
-    # In compatible mode, also append to vendor/odm seapp_contexts if they exist
+    # Read the zip entry once so that each destination is a plain buffer
+    # write instead of another inflate + CRC pass.
+    with zip.open(seapp_contexts_name, 'r') as f_in:
+        payload = f_in.read()
+
+    # One shared newline-terminated buffer for every destination. The
+    # writes go through the buffered file object, which retries short
+    # writes and raises on failure, unlike a raw writev on the fd.
+    if not payload.endswith(b'\n'):
+        payload += b'\n'
+
+    # (filesystem, relative path, must already exist) triples. The plat
+    # file is always appended to; vendor/odm only in compatible mode and
+    # only when the ROM ships them.
+    targets = [(ext_fs['system'], 'system/etc/selinux/plat_seapp_contexts', False)]
+
     if compatible_sepolicy:
-        for partition_name in ['vendor', 'odm']:
-            if partition_name not in ext_fs:
-                continue
-
-            partition_fs = ext_fs[partition_name]
-            seapp_file = f'{partition_name}/etc/selinux/{partition_name}_seapp_contexts'
-            seapp_path = (
-                partition_fs.tree
-                / partition_name
-                / 'etc'
-                / 'selinux'
-                / f'{partition_name}_seapp_contexts'
-            )
+        targets += [
+            (ext_fs[name], f'{name}/etc/selinux/{name}_seapp_contexts', True)
+            for name in ('vendor', 'odm')
+            if name in ext_fs
+        ]
 
-            if seapp_path.exists():
-                logger.info(f'Adding seapp contexts to: {seapp_file} (compatible mode)')
-                with (
-                    zip.open(seapp_contexts_name, 'r') as f_in,
-                    partition_fs.open(seapp_file, 'ab') as f_out,
-                ):
-                    shutil.copyfileobj(f_in, f_out)
-                    f_out.write(b'\n')
-            else:
-                logger.info(f'Skipping {seapp_file}: file does not exist')
+    for partition_fs, seapp_file, must_exist in targets:
+        if must_exist and not (partition_fs.tree / seapp_file).exists():
+            logger.info('Skipping %s: file does not exist', seapp_file)
+            continue
+
+        logger.info('Adding seapp contexts to: %s', seapp_file)
+        with partition_fs.open(seapp_file, 'ab') as f_out:
+            f_out.write(payload)
+
+
+# CIL rules for ueventd to access vendor firmware files
+# This fixes bootloops caused by firmware loading failures (e.g., ipa_fws.mdt)
+_UEVENTD_FIRMWARE_RULES = b"""
+; Added by my-avbroot-setup --compatible-sepolicy
+; Allow ueventd to access vendor firmware files during boot
+; Fixes bootloop from IPA/firmware loading failures during Custota updates
+(allow ueventd vendor_firmware_file (file (read open getattr)))
+(allow ueventd vendor_firmware_file (dir (read open search)))
+"""
+
+_UEVENTD_MARKER = b'my-avbroot-setup --compatible-sepolicy'
+
+
+def _marker_in_tail(path: Path, marker: bytes, tail_size: int = 65536) -> bool:
+    """
+    Check whether a marker appears near the end of a file.
+
+    CIL policy files are multiple MB of text, while the rule blocks we
+    append are tiny, so reading the last 64 KiB is enough to detect a
+    previous run without decoding the whole file. The window must stay
+    well above the combined size of every block we might append (a few
+    KB today), since an earlier run's marker is pushed away from EOF by
+    the blocks appended after it.
+    """
+    with open(path, 'rb') as f:
+        f.seek(max(0, os.path.getsize(path) - tail_size))
+        return marker in f.read()
 
 
 def patch_vendor_cil_for_ueventd(
@@ -138,16 +343,6 @@ def patch_vendor_cil_for_ueventd(
         ext_fs: Dictionary of filesystem objects by partition name
         compatible_sepolicy: If True, also patch odm_sepolicy.cil
     """
-    # CIL rules for ueventd to access vendor firmware files
-    # This fixes bootloops caused by firmware loading failures (e.g., ipa_fws.mdt)
-    ueventd_firmware_rules = """
-; Added by my-avbroot-setup --compatible-sepolicy
-; Allow ueventd to access vendor firmware files during boot
-; Fixes bootloop from IPA/firmware loading failures during Custota updates
-(allow ueventd vendor_firmware_file (file (read open getattr)))
-(allow ueventd vendor_firmware_file (dir (read open search)))
-"""
-
     # Patch vendor CIL if it exists
     if 'vendor' in ext_fs:
         vendor_cil_path = (
@@ -160,19 +355,18 @@ def patch_vendor_cil_for_ueventd(
 
         if vendor_cil_path.exists():
             # Check if rules already exist to avoid duplicates
-            existing_content = vendor_cil_path.read_text()
-            if 'my-avbroot-setup --compatible-sepolicy' in existing_content:
+            if _marker_in_tail(vendor_cil_path, _UEVENTD_MARKER):
                 logger.info(
                     'Ueventd firmware rules already present in vendor_sepolicy.cil'
                 )
             else:
-                with open(vendor_cil_path, 'a') as f:
-                    f.write(ueventd_firmware_rules)
+                with open(vendor_cil_path, 'ab') as f:
+                    f.write(_UEVENTD_FIRMWARE_RULES)
                 logger.info(
                     'Added ueventd firmware access rules to vendor_sepolicy.cil'
                 )
         else:
-            logger.warning(f'vendor_sepolicy.cil not found at {vendor_cil_path}')
+            logger.warning('vendor_sepolicy.cil not found at %s', vendor_cil_path)
 
     # Patch ODM CIL if --compatible-sepolicy is enabled and ODM partition exists
     if compatible_sepolicy and 'odm' in ext_fs:
@@ -185,19 +379,18 @@ def patch_vendor_cil_for_ueventd(
         )
 
         if odm_cil_path.exists():
-            existing_content = odm_cil_path.read_text()
-            if 'my-avbroot-setup --compatible-sepolicy' in existing_content:
+            if _marker_in_tail(odm_cil_path, _UEVENTD_MARKER):
                 logger.info(
                     'Ueventd firmware rules already present in odm_sepolicy.cil'
                 )
             else:
-                with open(odm_cil_path, 'a') as f:
-                    f.write(ueventd_firmware_rules)
+                with open(odm_cil_path, 'ab') as f:
+                    f.write(_UEVENTD_FIRMWARE_RULES)
                 logger.info('Added ueventd firmware access rules to odm_sepolicy.cil')
         else:
             logger.info(
-                f'odm_sepolicy.cil not found at {odm_cil_path} '
-                '(may not exist on this ROM)'
+                'odm_sepolicy.cil not found at %s (may not exist on this ROM)',
+                odm_cil_path,
             )
 
 
@@ -208,19 +401,20 @@ def patch_cil_policy(
 ) -> None:
     """Append SELinux rules to a CIL policy file once."""
     if not cil_path.exists():
-        logger.warning(f'CIL file does not exist: {cil_path}')
+        logger.warning('CIL file does not exist: %s', cil_path)
         return
 
-    if marker in cil_path.read_text():
-        logger.info(f'CIL file already patched: {cil_path}')
+    if _marker_in_tail(cil_path, marker.encode('UTF-8')):
+        logger.info('CIL file already patched: %s', cil_path)
         return
 
-    with open(cil_path, 'a') as f:
-        f.write(f'\n{marker}\n')
-        for rule in rules:
-            f.write(f'{rule}\n')
+    # Build the whole block up front so the append is a single write.
+    block = '\n'.join(['', marker, *rules, '']).encode('UTF-8')
+
+    with cil_path.open('ab') as f:
+        f.write(block)
 
-    logger.info(f'Patched CIL file: {cil_path}')
+    logger.info('Patched CIL file: %s', cil_path)
 
 
 def get_cil_rules_for_partition(
@@ -243,7 +437,7 @@ def get_cil_rules_for_partition(
 
     if not cil_path.exists():
         logger.info(
-            f'{partition}_sepolicy.cil not found (may not exist on this ROM)'
+            '%s_sepolicy.cil not found (may not exist on this ROM)', partition
         )
         return []
 
@@ -274,7 +468,10 @@ class Module(ABC):
         ...
 
 
+@functools.lru_cache(maxsize=1)
 def all_modules() -> dict[str, Callable[[Path, Path], Module]]:
+    # These imports have to stay local: the submodules import Module and
+    # ModuleRequirements back from this package.
     from lib.modules.alterinstaller import AlterInstallerModule
     from lib.modules.bcr import BCRModule
     from lib.modules.custota import CustotaModule
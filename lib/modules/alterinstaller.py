@@ -40,7 +40,7 @@ class AlterInstallerModule(Module):
         sepolicies: Iterable[Path],
         compatible_sepolicy: bool = False,
     ) -> None:
-        logger.info(f'Injecting AlterInstaller: {self.zip}')
+        logger.info('Injecting AlterInstaller: %s', self.zip)
 
         system_fs = ext_fs['system']
 
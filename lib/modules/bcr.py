@@ -40,19 +40,19 @@ class BCRModule(Module):
         sepolicies: Iterable[Path],
         compatible_sepolicy: bool = False,
     ) -> None:
-        logger.info(f'Injecting BCR: {self.zip}')
+        logger.info('Injecting BCR: %s', self.zip)
 
         system_fs = ext_fs['system']
         apk = None
 
         with zipfile.ZipFile(self.zip, 'r') as z:
-            for path in z.namelist():
-                if not path.endswith('.apk') and not path.endswith('.xml'):
-                    continue
-                elif path.endswith('.apk'):
-                    apk = path
+            paths = [
+                p for p in z.namelist()
+                if p.endswith('.apk') or p.endswith('.xml')
+            ]
+            apk = next((p for p in paths if p.endswith('.apk')), None)
 
-                modules.zip_extract(z, path, system_fs)
+            modules.zip_extract_all(z, paths, system_fs)
 
         assert apk
 
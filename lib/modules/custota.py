@@ -45,16 +45,17 @@ class CustotaModule(Module):
         sepolicies: Iterable[Path],
         compatible_sepolicy: bool = False,
     ) -> None:
-        logger.info(f'Injecting Custota: {self.zip}')
+        logger.info('Injecting Custota: %s', self.zip)
 
         system_fs = ext_fs['system']
 
         with zipfile.ZipFile(self.zip, 'r') as z:
-            for path in z.namelist():
-                if not path.endswith('.apk') and not path.endswith('.xml'):
-                    continue
-
-                modules.zip_extract(z, path, system_fs)
+            modules.zip_extract_all(
+                z,
+                (p for p in z.namelist()
+                 if p.endswith('.apk') or p.endswith('.xml')),
+                system_fs,
+            )
 
             # Add SELinux rules.
             with tempfile.NamedTemporaryFile(delete_on_close=False) as f_temp:
@@ -65,10 +66,10 @@ class CustotaModule(Module):
 
                 for sepolicy in sepolicies:
                     if compatible_sepolicy and not sepolicy.exists():
-                        logger.warning(f'SELinux policy does not exist: {sepolicy}')
+                        logger.warning('SELinux policy does not exist: %s', sepolicy)
                         continue
 
-                    logger.info(f'Adding Custota SELinux rules: {sepolicy}')
+                    logger.info('Adding Custota SELinux rules: %s', sepolicy)
 
                     linux_run(
                         [
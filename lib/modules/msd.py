@@ -46,22 +46,20 @@ class MSDModule(Module):
         sepolicies: Iterable[Path],
         compatible_sepolicy: bool = False,
     ) -> None:
-        logger.info(f'Injecting MSD: {self.zip}')
+        logger.info('Injecting MSD: %s', self.zip)
 
         system_fs = ext_fs['system']
 
         with zipfile.ZipFile(self.zip, 'r') as z:
+            entries: list[tuple[str, str | None, int]] = []
+
             for path in z.namelist():
                 if path == 'msd-tool.arm64-v8a':
-                    dest_path = 'system/bin/msd-tool'
-                    perms = 0o755
+                    entries.append((path, 'system/bin/msd-tool', 0o755))
                 elif path.endswith('.apk') or path.endswith('.xml'):
-                    dest_path = path
-                    perms = 0o644
-                else:
-                    continue
+                    entries.append((path, path, 0o644))
 
-                modules.zip_extract(z, path, system_fs, mode=perms, output=dest_path)
+            modules.zip_extract_all(z, entries, system_fs)
 
             # Add SELinux rules.
             with tempfile.NamedTemporaryFile(delete_on_close=False) as f_temp:
@@ -72,9 +70,9 @@ class MSDModule(Module):
 
                 for sepolicy in sepolicies:
                     if compatible_sepolicy and not sepolicy.exists():
-                        logger.warning(f'SELinux policy does not exist: {sepolicy}')
+                        logger.warning('SELinux policy does not exist: %s', sepolicy)
                         continue
-                    logger.info(f'Adding MSD SELinux rules: {sepolicy}')
+                    logger.info('Adding MSD SELinux rules: %s', sepolicy)
 
                     linux_run(
                         [
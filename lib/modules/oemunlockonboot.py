@@ -40,7 +40,7 @@ class OEMUnlockOnBootModule(Module):
         sepolicies: Iterable[Path],
         compatible_sepolicy: bool = False,
     ) -> None:
-        logger.info(f'Injecting OEMUnlockOnBoot: {self.zip}')
+        logger.info('Injecting OEMUnlockOnBoot: %s', self.zip)
 
         system_fs = ext_fs['system']
 
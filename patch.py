@@ -392,7 +392,7 @@ def main():
 
         if args.debug_shell:
             shell = os.getenv('SHELL', 'bash')
-            logger.info(f'Debug shell: {shell}')
+            logger.info('Debug shell: %s', shell)
             subprocess.run([shell], cwd=temp_dir)
 
         exit(exit_code)